@@ -0,0 +1,170 @@
+from .parser import Defun, Call, Variable, IntConstant, StrConstant
+from .types import ConstructedType, AtomicType, IndefiniteType, QuantifiedType, typify
+from .generic import generic
+import sys
+
+# expressions are compiled once into closures taking a frame (the tuple
+# of arguments to the enclosing function), and then run directly
+
+class RunError(Exception):
+    pass
+
+class ScopeItem:
+    def __init__(self, type, code):
+        self.type = type
+        self.code = code
+
+class Argument(ScopeItem):
+    # code here reads the value out of the frame, instead of being the value
+    pass
+
+def wrap_int(i):
+    # match the 32-bit ints used by the llvm backend
+    return (i + 0x80000000) % 0x100000000 - 0x80000000
+
+class Builtin:
+    pass
+
+class Add(Builtin):
+    type = ConstructedType('fn', AtomicType('int'), AtomicType('int'), AtomicType('int'))
+
+    def call(self, a, b):
+        return wrap_int(a + b)
+
+class PutS(Builtin):
+    type = ConstructedType('fn', AtomicType('int'), AtomicType('str'))
+
+    def call(self, s):
+        # like C puts, return a non-negative int on success
+        return sys.stdout.write(s + "\n")
+
+def get_builtins():
+    builtins = {
+        '+': Add(),
+        'puts': PutS()
+    }
+    return builtins
+
+@generic
+def compile_expression(expr, scope, types):
+    pass
+
+@compile_expression.implementation(IntConstant)
+def ce_IntConstant(expr, scope, types):
+    v = wrap_int(int(expr.info))
+    return lambda frame: v
+
+@compile_expression.implementation(StrConstant)
+def ce_StrConstant(expr, scope, types):
+    v = expr.info
+    return lambda frame: v
+
+def resolve(expr, scope):
+    # the python callable for expr, if it never changes, or None
+    if not isinstance(expr, Variable):
+        return None
+    v = scope.get(expr.info)
+    if isinstance(v, Builtin):
+        return v.call
+    if isinstance(v, ScopeItem) and not isinstance(v, Argument):
+        return v.code
+    return None
+
+@compile_expression.implementation(Variable)
+def ce_Variable(expr, scope, types):
+    v = scope[expr.info]
+    if isinstance(v, Argument):
+        return v.code
+    if isinstance(v, Builtin):
+        value = v.call
+    else:
+        value = v.code
+    return lambda frame: value
+
+@compile_expression.implementation(Call)
+def ce_Call(expr, scope, types):
+    op = resolve(expr.info['function'], scope)
+    args = [compile_expression(a, scope, types) for a in expr.info['tail']]
+    if op is not None:
+        # resolved now, so the call goes straight to the python function
+        if len(args) == 0:
+            return lambda frame: op()
+        if len(args) == 1:
+            a, = args
+            return lambda frame: op(a(frame))
+        if len(args) == 2:
+            a, b = args
+            return lambda frame: op(a(frame), b(frame))
+        return lambda frame: op(*[a(frame) for a in args])
+    else:
+        func = compile_expression(expr.info['function'], scope, types)
+        return lambda frame: func(frame)(*[a(frame) for a in args])
+
+def argument(i):
+    return lambda frame: frame[i]
+
+def function_type(ty):
+    # values carry no types at runtime, so polymorphic functions only
+    # need their quantifiers stripped to find the argument types
+    while isinstance(ty, QuantifiedType):
+        ty = ty.instantiate()
+    return ty
+
+@generic
+def compile_statement(stat, scope):
+    pass
+
+@compile_statement.implementation(Defun)
+def cs_Defun(stat, scope):
+    typerscope = {}
+    subscope = scope.copy()
+    for k, v in scope.items():
+        typerscope[k] = v.type
+    types = typify(stat, typerscope)
+
+    ty = types.get(stat.type, stat.type)
+
+    name = stat.info['name']
+    argtypes = function_type(ty).args[1:]
+    for i, (argname, argtype) in enumerate(zip(stat.info['arguments'], argtypes)):
+        subscope[argname] = Argument(argtype, argument(i))
+
+    body = compile_expression(stat.info['tail'][-1], subscope, types)
+    def fn(*frame):
+        return body(frame)
+    fn.__name__ = name
+
+    scope[name] = ScopeItem(ty, fn)
+
+def is_int(ty):
+    # unconstrained type variables are fine too, since an int fits them
+    return ty == AtomicType('int') or isinstance(ty, IndefiniteType)
+
+def run(scope, argv):
+    # run main like the C runtime would, and return its exit status
+    if 'main' not in scope:
+        raise RunError("no main function")
+    main = scope['main']
+    ret, *argtypes = function_type(main.type).args
+    if not is_int(ret):
+        raise RunError("main must return an int")
+    if len(argtypes) == 0:
+        return main.code()
+    elif len(argtypes) == 1 and is_int(argtypes[0]):
+        return main.code(len(argv))
+    else:
+        raise RunError("main must take no arguments, or only an int argc")
+
+if __name__ == '__main__':
+    from .parser import parse_statement
+    from .tokenizer import tokenize
+
+    scope = get_builtins()
+    for tok in tokenize(sys.stdin):
+        ast = parse_statement(tok)
+        compile_statement(ast, scope)
+
+    try:
+        sys.exit(run(scope, sys.argv))
+    except RunError as e:
+        sys.exit(str(e))
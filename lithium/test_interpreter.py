@@ -0,0 +1,69 @@
+import os.path
+import subprocess
+import sys
+import unittest
+
+# run with python3 -m lithium.test_interpreter
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def interpret(source, *args):
+    # run source the same way `lic -i` does
+    return subprocess.run([sys.executable, '-m', 'lithium.interpreter'] + list(args),
+                          input=source, cwd=root, capture_output=True, text=True)
+
+class InterpreterTest(unittest.TestCase):
+    def check(self, source, status, stdout="", stderr="", args=()):
+        result = interpret(source, *args)
+        self.assertEqual(result.stderr, stderr)
+        self.assertEqual(result.stdout, stdout)
+        self.assertEqual(result.returncode, status)
+
+    def test_return(self):
+        self.check('(defun main () 42)', 42)
+
+    def test_higher_order(self):
+        self.check('''
+            (defun inc (x) (+ x 1))
+            (defun twice (f x) (f (f x)))
+            (defun main (argc) (twice inc argc))
+        ''', 3)
+
+    def test_builtin_as_value(self):
+        self.check('''
+            (defun f (g) (g 1 2))
+            (defun main () (f +))
+        ''', 3)
+
+    def test_wraparound(self):
+        self.check('''
+            (defun one () (+ 2147483647 1))
+            (defun main () (+ (one) 2147483647))
+        ''', 255)
+
+    def test_puts(self):
+        # puts returns the number of bytes written, newline included
+        self.check('(defun main () (puts "hello"))', 6, stdout="hello\n")
+
+    def test_argc(self):
+        self.check('(defun main (argc) argc)', 3, args=('a', 'b'))
+
+    def test_no_main(self):
+        self.check('(defun f () 0)', 1, stderr="no main function\n")
+
+    def test_main_returns_str(self):
+        self.check('(defun main () "s")', 1, stderr="main must return an int\n")
+
+    def test_main_returns_fn(self):
+        self.check('(defun main () +)', 1, stderr="main must return an int\n")
+
+    def test_main_takes_fn(self):
+        self.check('(defun main (f) (f 1))', 1,
+                   stderr="main must take no arguments, or only an int argc\n")
+
+    def test_main_takes_str(self):
+        self.check('(defun main (s) (puts s))', 1,
+                   stderr="main must take no arguments, or only an int argc\n")
+
+if __name__ == '__main__':
+    unittest.main()